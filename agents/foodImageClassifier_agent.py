@@ -8,11 +8,22 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Server params for the local MCP tool process
+mcp_server_prxy = StdioServerParams(command="python", args=["../mcp_server/mcp_server.py"])
+
+# Tool adapters open their own MCP session per call, so the discovered list can be reused
+_tools = None
+
+async def load_classifier_tools():
+    """Discover the MCP server tools once per process."""
+    global _tools
+    if _tools is None:
+        _tools = await mcp_server_tools(mcp_server_prxy)
+    return _tools
+
 async def classify_food_image(image_path: str):
     """Classify a food image and return the result."""
-    # Create server params for the local MCP tool process
-    mcp_server_prxy = StdioServerParams(command="python", args=["../mcp_server/mcp_server.py"])
-    tools = await mcp_server_tools(mcp_server_prxy)
+    tools = await load_classifier_tools()
     # Create an agent that can use the classify tool
     model_client = OpenAIChatCompletionClient(model="gpt-4o")
     agent = AssistantAgent(
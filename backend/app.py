@@ -5,17 +5,21 @@ A comprehensive API for food classification and USDA food data access
 """
 
 import os
+import asyncio
 import logging
 from typing import Optional, Dict, Any
 from pathlib import Path
 import sys
+import threading
 
 import torch
 import torch.nn as nn
 import torchvision
-from torchvision import transforms
+from torchvision.transforms import v2 as transforms
 from PIL import Image
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Depends
@@ -47,8 +51,21 @@ CLASS_NAMES = [
     'sandwich', 'sushi', 'taco', 'taquito'
 ]
 
-# Global model cache
+# Global model cache; the lock keeps concurrent first calls from loading it twice
 _model = None
+_model_lock = threading.Lock()
+
+# Image preprocessing pipeline (ImageNet normalization), built once
+_preprocess = transforms.Compose([
+    transforms.PILToTensor(),
+    transforms.Resize(256, antialias=True),
+    transforms.CenterCrop(224),
+    transforms.ToDtype(torch.float32, scale=True),
+    transforms.Normalize([0.485, 0.456, 0.406], [0.229, 0.224, 0.225])
+])
+
+# Global HTTP session for USDA API calls (connection pooling + keep-alive)
+_http_session = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -102,34 +119,51 @@ def load_classification_model():
     """Load the EfficientNet model for food classification."""
     global _model
     if _model is None:
-        device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
-        model_path = project_root / "models" / "model_efficientnet_v2_m_1.pth"
-
-        if not model_path.exists():
-            raise FileNotFoundError(f"Model file not found at {model_path}")
-
-        model = torchvision.models.efficientnet_v2_m(pretrained=False)
-        num_ftrs = model.classifier[1].in_features
-        model.classifier[1] = nn.Linear(num_ftrs, len(CLASS_NAMES))
-        model.load_state_dict(torch.load(model_path, map_location=device))
-        model = model.to(device)
-        model.eval()
-        _model = model
-        logger.info("Food classification model loaded successfully")
+        with _model_lock:
+            if _model is None:
+                device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
+                model_path = project_root / "models" / "model_efficientnet_v2_m_1.pth"
+
+                if not model_path.exists():
+                    raise FileNotFoundError(f"Model file not found at {model_path}")
+
+                model = torchvision.models.efficientnet_v2_m(weights=None)
+                num_ftrs = model.classifier[1].in_features
+                model.classifier[1] = nn.Linear(num_ftrs, len(CLASS_NAMES))
+                # Memory-map the checkpoint and adopt its tensors instead of copying into fresh ones
+                state_dict = torch.load(model_path, map_location=device, mmap=True, weights_only=True)
+                model.load_state_dict(state_dict, assign=True)
+                model = model.to(device)
+                if device.type == "cuda":
+                    # Half precision + NHWC lets cuDNN use tensor cores for the convolutions
+                    model = model.to(memory_format=torch.channels_last).half()
+                model.eval()
+                _model = model
+                logger.info("Food classification model loaded successfully")
     return _model
 
 def preprocess_image(image_file):
     """Preprocess uploaded image for model prediction."""
-    image = Image.open(image_file).convert('RGB')
-
-    preprocess = transforms.Compose([
-        transforms.Resize(256),
-        transforms.CenterCrop(224),
-        transforms.ToTensor(),
-        transforms.Normalize([0.485, 0.456, 0.406], [0.229, 0.224, 0.225])
-    ])
-
-    return preprocess(image).unsqueeze(0)
+    image = Image.open(image_file)
+    # JPEGs can decode straight at a reduced DCT scale; Resize(256) shrinks them anyway
+    image.draft('RGB', (256, 256))
+    return _preprocess(image.convert('RGB')).unsqueeze(0)
+
+def get_http_session() -> requests.Session:
+    """Return a shared requests session so USDA calls reuse pooled connections."""
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=(502, 503, 504))
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["User-Agent"] = "CalorieCoach/1.0"
+        _http_session = session
+    return _http_session
 
 async def make_usda_request(endpoint: str, params: Dict[str, Any]) -> dict:
     """Make request to USDA API with error handling."""
@@ -139,13 +173,53 @@ async def make_usda_request(endpoint: str, params: Dict[str, Any]) -> dict:
     params['api_key'] = USDA_API_KEY
 
     try:
-        response = requests.get(f"{BASE_URL}/{endpoint}", params=params, timeout=30)
+        # requests is blocking; run it in a worker thread so the event loop keeps serving
+        response = await asyncio.to_thread(
+            get_http_session().get, f"{BASE_URL}/{endpoint}", params=params, timeout=30
+        )
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
         logger.error(f"USDA API error: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch data from USDA API")
 
+# Core operations, callable without an HTTP request (used by the routes and by the MCP server in-process)
+async def search_food_data(food_name: str) -> dict:
+    """Return the first USDA FoodData Central search result page for a food name."""
+    params = {
+        'query': food_name,
+        'pageSize': 1,
+        'pageNumber': 1,
+        'sortBy': 'dataType.keyword',
+        'sortOrder': 'asc'
+    }
+    return await make_usda_request('foods/search', params)
+
+def predict_food_class(image_file) -> dict:
+    """Classify an image file object and return the predicted class with its confidence (%)."""
+    model = load_classification_model()
+
+    # Preprocess image and match the model's device, dtype and memory layout
+    param = next(model.parameters())
+    image_tensor = preprocess_image(image_file).to(param.device, dtype=param.dtype, non_blocking=True)
+    if param.is_cuda:
+        image_tensor = image_tensor.contiguous(memory_format=torch.channels_last)
+
+    # Make prediction
+    with torch.inference_mode():
+        output = model(image_tensor)
+
+    # Get predicted class
+    probabilities = torch.nn.functional.softmax(output.float(), dim=1)
+    predicted_class_index = torch.argmax(probabilities, dim=1).item()
+    confidence = probabilities[0][predicted_class_index].item() * 100
+
+    return {
+        "predicted_class": CLASS_NAMES[predicted_class_index],
+        "confidence": round(confidence, 2),
+        "success": True
+    }
+
 # Routes
 
 @app.get("/", include_in_schema=False)
@@ -171,16 +245,7 @@ async def search_foods(
     Returns the first result matching the food name query.
     """
     try:
-        params = {
-            'query': food_name,
-            'pageSize': 1,
-            'pageNumber': 1,
-            'sortBy': 'dataType.keyword',
-            'sortOrder': 'asc'
-        }
-
-        result = await make_usda_request('foods/search', params)
-        return result
+        return await search_food_data(food_name)
 
     except HTTPException:
         raise
@@ -209,27 +274,7 @@ async def classify_food_image(
         raise HTTPException(status_code=400, detail="File must be an image")
 
     try:
-        # Load model
-        model = load_classification_model()
-
-        # Preprocess image
-        image_tensor = preprocess_image(file.file)
-
-        # Make prediction
-        with torch.no_grad():
-            output = model(image_tensor)
-
-        # Get predicted class
-        probabilities = torch.nn.functional.softmax(output, dim=1)
-        predicted_class_index = torch.argmax(probabilities, dim=1).item()
-        predicted_class_name = CLASS_NAMES[predicted_class_index]
-        confidence = probabilities[0][predicted_class_index].item() * 100
-
-        return ClassificationResponse(
-            predicted_class=predicted_class_name,
-            confidence=round(confidence, 2),
-            success=True
-        )
+        return ClassificationResponse(**predict_food_class(file.file))
 
     except FileNotFoundError:
         logger.error("Model file not found")
@@ -1,13 +1,28 @@
 import asyncio
+import io
 import json
+import os
+import sys
+from pathlib import Path
 import httpx
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
+from mcp.server.stdio import stdio_server
 from mcp.types import Resource, Tool, TextContent
-from mpmath.libmp import BACKEND
 from pydantic import AnyUrl
 import mcp.types as types
 
+try:
+    # Optional: libuv-based event loop, faster pipe and socket I/O (not available on Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; fall back to the stdlib codec
+    orjson = None
+
 """MCP Server for Food Data Central tools.
 
 This module exposes a set of tools (via MCP protocol) that an LLM can call to
@@ -22,24 +37,6 @@ Exposed tools (LLM-callable):
   Output: list with one TextContent item containing the JSON string result
   Errors: returns a single TextContent with an error message on failure
 
-- get_food_details(args): Fetch details for a single food by FDC ID
-  Input schema:
-    {
-      fdc_id: integer (required),
-      format?: 'full'|'abridged' (default 'full')
-    }
-  Output: list with one TextContent item containing the JSON string result
-  Errors: returns a single TextContent with an error message on failure
-
-- get_multiple_foods(args): Fetch details for multiple foods
-  Input schema:
-    {
-      fdc_ids: integer[] (required),
-      format?: 'full'|'abridged' (default 'full')
-    }
-  Output: list with one TextContent item containing the JSON string result
-  Errors: returns a single TextContent with an error message on failure
-
 - classify(args): Classify a food image and return the predicted class and confidence score.
   Input schema:
     {
@@ -50,12 +47,87 @@ Exposed tools (LLM-callable):
 
 General behavior:
 - This server proxies requests to the Flask API; it does not talk to USDA directly.
+  With MCP_IN_PROCESS=1, search_foods and classify call the backend functions directly instead.
 - All outputs are returned as an array of content blocks (here, TextContent only).
 - Network issues or non-2xx responses will surface as error TextContent.
 """
 
 # Configuration
 BACKEND_URL = "http://localhost:8004"
+# Set MCP_IN_PROCESS=1 to call the backend's functions directly instead of over HTTP.
+# Only useful when the backend code and model live on this machine; importing it pulls in torch.
+IN_PROCESS = os.getenv("MCP_IN_PROCESS") == "1"
+
+_backend = None
+
+# Resource/Tool catalogs are static, so validate them once at import instead of per listing
+_RESOURCES = [
+    Resource(
+        uri=AnyUrl("food://search"),
+        name="Food Search",
+        description="Search for foods in USDA database",
+        mimeType="application/json"
+    ),
+    Resource(
+        uri=AnyUrl("food://details"),
+        name="Food Details",
+        description="Get detailed food information",
+        mimeType="application/json"
+    )
+]
+
+_TOOLS = [
+    Tool(
+        name="search_foods",
+        description="Search for foods in the USDA FoodData Central database",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query for food items"
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="classify",
+        description="Classify a food image and return the predicted class and confidence score.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "image_path": {
+                    "type": "string",
+                    "description": "Path to the image file to classify. Must be accessible to the server."
+                }
+            },
+            "required": ["image_path"]
+        }
+    )
+]
+
+
+def _dumps(obj) -> str:
+    """Serialize to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _http_error(response: httpx.Response) -> list[TextContent]:
+    """Build the error content for a non-2xx backend response without raising."""
+    return [TextContent(type="text", text=f"Error: backend returned HTTP {response.status_code}: {response.text[:500]}")]
+
+
+def _backend_module():
+    """Import backend/app.py on first use (only in in-process mode)."""
+    global _backend
+    if _backend is None:
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+        from backend import app as backend_app
+        _backend = backend_app
+    return _backend
 
 
 class FoodDataMCPServer:
@@ -70,9 +142,15 @@ class FoodDataMCPServer:
     - Instantiate, then call run() to start stdio server for MCP transport.
     """
 
+    __slots__ = ("server", "client", "_dispatch", "_init_options")
+
     def __init__(self):
         self.server = Server("food-data-central")
-        self.client = httpx.AsyncClient()
+        # Keep-alive pool to the backend; classification on CPU can take a while, hence the timeout
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(30.0)
+        )
 
     async def setup_handlers(self):
         """Setup MCP server handlers for resources and tools.
@@ -83,6 +161,11 @@ class FoodDataMCPServer:
         - list_tools: Publishes available tool metadata and input schemas
         - call_tool: Entry point for LLM tool invocations
         """
+        # Tool name -> coroutine, built once so each call is a single dict lookup
+        self._dispatch = {
+            "search_foods": self._search_foods,
+            "classify": self._classify,
+        }
 
         @self.server.list_resources()
         async def handle_list_resources() -> list[Resource]:
@@ -91,20 +174,7 @@ class FoodDataMCPServer:
             Outputs: a list of Resource with uri/name/description/mimeType.
             Errors: raises ValueError only if misconfigured (not expected).
             """
-            return [
-                Resource(
-                    uri=AnyUrl("food://search"),
-                    name="Food Search",
-                    description="Search for foods in USDA database",
-                    mimeType="application/json"
-                ),
-                Resource(
-                    uri=AnyUrl("food://details"),
-                    name="Food Details",
-                    description="Get detailed food information",
-                    mimeType="application/json"
-                )
-            ]
+            return _RESOURCES
 
         @self.server.read_resource()
         async def handle_read_resource(uri: AnyUrl) -> str:
@@ -120,7 +190,7 @@ class FoodDataMCPServer:
             if str(uri) == "food://search":
                 return "Use the search_foods tool to search for foods"
             elif str(uri) == "food://details":
-                return "Use the get_food_details tool to get food information"
+                return "Use the search_foods tool; each result includes its nutrients"
             else:
                 raise ValueError(f"Unknown resource: {uri}")
 
@@ -131,77 +201,7 @@ class FoodDataMCPServer:
             Outputs: array of Tool with JSON schema for inputs.
             Notes: All tools return a list[TextContent] on success/failure.
             """
-            return [
-                Tool(
-                    name="search_foods",
-                    description="Search for foods in the USDA FoodData Central database",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Search query for food items"
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                ),
-                # Tool(
-                #     name="get_food_details",
-                #     description="Get detailed information about a specific food item",
-                #     inputSchema={
-                #         "type": "object",
-                #         "properties": {
-                #             "fdc_id": {
-                #                 "type": "integer",
-                #                 "description": "Food Data Central ID"
-                #             },
-                #             "format": {
-                #                 "type": "string",
-                #                 "enum": ["full", "abridged"],
-                #                 "default": "full",
-                #                 "description": "Response format"
-                #             }
-                #         },
-                #         "required": ["fdc_id"]
-                #     }
-                # ),
-                # Tool(
-                #     name="get_multiple_foods",
-                #     description="Get information about multiple food items",
-                #     inputSchema={
-                #         "type": "object",
-                #         "properties": {
-                #             "fdc_ids": {
-                #                 "type": "array",
-                #                 "items": {"type": "integer"},
-                #                 "description": "List of Food Data Central IDs"
-                #             },
-                #             "format": {
-                #                 "type": "string",
-                #                 "enum": ["full", "abridged"],
-                #                 "default": "full",
-                #                 "description": "Response format"
-                #             }
-                #         },
-                #         "required": ["fdc_ids"]
-                #     }
-                # ),
-                Tool(
-                    name="classify",
-                    description="Classify a food image and return the predicted class and confidence score.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "image_path": {
-                                "type": "string",
-                                "description": "Path to the image file to classify. Must be accessible to the server."
-                            }
-                        },
-                        "required": ["image_path"]
-                    }
-                )
-            ]
+            return _TOOLS
 
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: dict) -> list[
@@ -209,7 +209,7 @@ class FoodDataMCPServer:
             """Dispatch a tool call requested by the LLM.
 
             Inputs:
-            - name: one of 'search_foods' | 'get_food_details' | 'get_multiple_foods'
+            - name: one of 'search_foods' | 'classify'
             - arguments: JSON object matching the tool's inputSchema
 
             Outputs:
@@ -222,19 +222,23 @@ class FoodDataMCPServer:
             - Any exception during HTTP calls is caught and returned as TextContent
             """
             try:
-                if name == "search_foods":
-                    return await self._search_foods(arguments)
-                elif name == "get_food_details":
-                    return await self._get_food_details(arguments)
-                elif name == "get_multiple_foods":
-                    return await self._get_multiple_foods(arguments)
-                elif name == "classify":
-                    return await self._classify(arguments)
-                else:
+                handler = self._dispatch.get(name)
+                if handler is None:
                     raise ValueError(f"Unknown tool: {name}")
+                return await handler(arguments)
             except Exception as e:
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
 
+        # Capabilities depend on the handlers registered above, so build the options once here
+        self._init_options = InitializationOptions(
+            server_name="food-data-central",
+            server_version="1.0.0",
+            capabilities=self.server.get_capabilities(
+                notification_options=NotificationOptions(),
+                experimental_capabilities={}
+            )
+        )
+
     async def _search_foods(self, args: dict) -> list[TextContent]:
         """Search for foods via the Flask API.
 
@@ -242,64 +246,25 @@ class FoodDataMCPServer:
         - query (str, required)
         Behavior: GET {FLASK_API_BASE_URL}/api/search?food_name=<query>
         Success output: [TextContent(text='<json>')]
-        Errors: raises httpx.HTTPError (caught by caller and returned as TextContent)
+        Errors: non-2xx responses return an error TextContent; transport errors raise
+        httpx.HTTPError (caught by caller and returned as TextContent)
         Example call:
         - {"name":"search_foods","arguments":{"query":"apple"}}
         """
+        if IN_PROCESS:
+            result = await _backend_module().search_food_data(args["query"])
+            return [TextContent(type="text", text=_dumps(result))]
+
         params = {
             "food_name": args["query"]
         }
 
         response = await self.client.get(f"{BACKEND_URL}/api/search", params=params)
-        response.raise_for_status()
-
-        result = response.json()
-        return [TextContent(type="text", text=json.dumps(result))]
-
-    async def _get_food_details(self, args: dict) -> list[TextContent]:
-        """Get single food details via the Flask API.
-
-        Inputs (args):
-        - fdc_id (int, required)
-        - format (str, optional)
-        Behavior: GET {FLASK_API_BASE_URL}/api/food/{fdc_id}
-        Success output: [TextContent(text='<json>')]
-        Errors: raises httpx.HTTPError (caught by caller and returned as TextContent)
-        Example call:
-        - {"name":"get_food_details","arguments":{"fdc_id":2344719,"format":"abridged"}}
-        """
-        fdc_id = args["fdc_id"]
-        params = {"format": args.get("format", "full")}
-
-        response = await self.client.get(f"{BACKEND_URL}/api/food/{fdc_id}", params=params)
-        response.raise_for_status()
-
-        result = response.json()
-        return [TextContent(type="text", text=json.dumps(result))]
-
-    async def _get_multiple_foods(self, args: dict) -> list[TextContent]:
-        """Get multiple food details via the Flask API.
+        if response.is_error:
+            return _http_error(response)
 
-        Inputs (args):
-        - fdc_ids (int[], required)
-        - format (str, optional)
-        Behavior: GET {FLASK_API_BASE_URL}/api/foods?fdcIds=...&format=...
-        Success output: [TextContent(text='<json>')]
-        Errors: raises httpx.HTTPError (caught by caller and returned as TextContent)
-        Example call:
-        - {"name":"get_multiple_foods","arguments":{"fdc_ids":[2344719,2344720]}}
-        """
-        fdc_ids = ",".join(map(str, args["fdc_ids"]))
-        params = {
-            "fdcIds": fdc_ids,
-            "format": args.get("format", "full")
-        }
-
-        response = await self.client.get(f"{BACKEND_URL}/api/foods", params=params)
-        response.raise_for_status()
-
-        result = response.json()
-        return [TextContent(type="text", text=json.dumps(result))]
+        # Forward the backend's JSON body as-is rather than decoding and re-encoding it
+        return [TextContent(type="text", text=response.text)]
 
     async def _classify(self, args: dict) -> list[TextContent]:
         """Classify a food image via the Flask API.
@@ -307,16 +272,23 @@ class FoodDataMCPServer:
         - image_path (str, required): Path to the image file accessible to the server.
         Behavior: POST {FLASK_API_BASE_URL}/api/classify with image file
         Success output: [TextContent(text='<json>')]
-        Errors: raises httpx.HTTPError (caught by caller and returned as TextContent)
+        Errors: non-2xx responses return an error TextContent; transport errors raise
+        httpx.HTTPError (caught by caller and returned as TextContent)
         """
         image_path = args["image_path"]
-        # Open the image file and send as multipart/form-data
-        with open(image_path, "rb") as f:
-            files = {"file": (image_path, f, "image/jpeg")}
-            response = await self.client.post(f"{BACKEND_URL}/api/classify", files=files)
-            response.raise_for_status()
-            result = response.json()
-            return [TextContent(type="text", text=json.dumps(result))]
+        # Read the image off the event loop, then send it as multipart/form-data
+        data = await asyncio.to_thread(Path(image_path).read_bytes)
+
+        if IN_PROCESS:
+            # Model inference is CPU/GPU-bound, keep it off the event loop
+            result = await asyncio.to_thread(_backend_module().predict_food_class, io.BytesIO(data))
+            return [TextContent(type="text", text=_dumps(result))]
+
+        files = {"file": (os.path.basename(image_path), data, "image/jpeg")}
+        response = await self.client.post(f"{BACKEND_URL}/api/classify", files=files)
+        if response.is_error:
+            return _http_error(response)
+        return [TextContent(type="text", text=response.text)]
 
     async def run(self):
         """Run the MCP server with stdio transport.
@@ -324,25 +296,20 @@ class FoodDataMCPServer:
         Behavior:
         - Registers handlers
         - Opens stdio transport and runs the MCP server loop
+        - Closes the backend HTTP client when the loop exits
         """
         await self.setup_handlers()
 
         # Run server with stdio transport
-        from mcp.server.stdio import stdio_server
-
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="food-data-central",
-                    server_version="1.0.0",
-                    capabilities=self.server.get_capabilities(
-                        notification_options=NotificationOptions(),
-                        experimental_capabilities={}
-                    )
-                )
-            )
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(read_stream, write_stream, self._init_options)
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Close the pooled HTTP connections to the backend."""
+        await self.client.aclose()
 
 
 async def main():
@@ -355,4 +322,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -7,121 +7,499 @@ integration for intelligent food summary analysis.
 """
 
 import asyncio
+import hashlib
 import json
 import os
+import sqlite3
 import sys
+import time
+from collections import OrderedDict
+from contextlib import closing
 from pathlib import Path
-from typing import Dict, Any, List, Optional, cast
+from types import SimpleNamespace
+from typing import Dict, Any, Callable, List, Optional
 
+import httpx
 from dotenv import load_dotenv
 from mcp.client.session import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
 
-# Load environment variables
-load_dotenv()
+try:
+    import orjson
+except ImportError:  # optional speed-up; fall back to the stdlib codec
+    orjson = None
+
+try:
+    from openai import OpenAI
+except ImportError:  # only needed for the OpenAI-powered analysis
+    OpenAI = None
 
 ROOT = Path(__file__).resolve().parents[1]
+
+# Load environment variables from the project's .env (no directory walk-up search)
+load_dotenv(ROOT / ".env")
 MCP_SERVER_PATH = ROOT / "mcp_server" / "mcp_server.py"
+# The server is always launched the same way, so the parameters are built once
+MCP_SERVER_PARAMS = StdioServerParameters(command=sys.executable, args=[str(MCP_SERVER_PATH)], env=None)
+
+# OpenAI settings, read once after .env is loaded
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_MODEL = os.getenv("OPENAI_TEST_MODEL", "gpt-4o-mini")
+
+# With a USDA key available, searches go straight to FoodData Central instead of through MCP
+USDA_API_KEY = os.getenv("USDA_API_KEY")
+USDA_BASE_URL = "https://api.nal.usda.gov/fdc/v1"
+
+# Upper bound on tool calls in flight over one MCP session
+MAX_CONCURRENT_TOOL_CALLS = 8
+# Seconds to wait for a single tool call; a little over the MCP server's own backend timeout
+TOOL_CALL_TIMEOUT = 35.0
+
+# On-disk cache of search_foods results, shared across processes and runs
+SEARCH_CACHE_PATH = ROOT / "tools" / "search_cache.sqlite"
+SEARCH_CACHE_TTL = 30 * 24 * 60 * 60  # seconds; USDA entries rarely change
+
+# Budget for tool replies kept in the OpenAI message history; oldest are truncated beyond it
+MAX_TOOL_HISTORY_CHARS = 80_000
+
+# In-memory cache of tool results per helper (entries, seconds)
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_TTL = 60 * 60
+
+# USDA nutrient names reported by food_summary_basic -> short key used in its result
+_WANTED_NUTRIENTS = {
+    "Energy": "calories",
+    "Protein": "protein",
+    "Carbohydrate, by difference": "carbs",
+    "Total lipid (fat)": "fat",
+    "Fiber, total dietary": "fiber",
+    "Sodium, Na": "sodium",
+}
+
+# food_summary_basic summary lines: (result key, display name, unit)
+_SUMMARY_LINES = (
+    ("calories", "Calories", " kcal"),
+    ("protein", "Protein", "g"),
+    ("carbs", "Carbohydrates", "g"),
+    ("fat", "Fat", "g"),
+    ("fiber", "Fiber", "g"),
+    ("sodium", "Sodium", "mg"),
+)
+
+
+def _loads(data):
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj) -> str:
+    """Serialize to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+# Food record fields passed to the model; everything else is dropped to keep prompts small
+_PROMPT_FOOD_FIELDS = ("fdcId", "description", "servingSize", "servingSizeUnit", "ingredients")
+
+
+def _compact_food(food: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a USDA search hit to the fields the model summarizes, nutrients as name -> 'value unit'."""
+    compact = {field: food[field] for field in _PROMPT_FOOD_FIELDS if food.get(field) not in (None, "")}
+    compact["nutrients"] = {
+        nutrient["nutrientName"]: f"{nutrient.get('value')} {nutrient.get('unitName', '').lower()}"
+        for nutrient in food.get("foodNutrients", ())
+        if "nutrientName" in nutrient
+    }
+    return compact
+
+
+def _digest_tool_result(content: str) -> str:
+    """Shrink a search reply the model has already read to ids, names and energy."""
+    try:
+        data = _loads(content)
+    except json.JSONDecodeError:
+        return content
+    if not isinstance(data, dict) or not data.get("foods"):
+        # Errors and classifications are already small
+        return content
+    return _dumps({
+        "summarized": True,
+        "foods": [
+            {
+                "fdcId": food.get("fdcId"),
+                "description": food.get("description"),
+                "energy": food.get("nutrients", {}).get("Energy")
+            }
+            for food in data["foods"]
+        ]
+    })
+
+
+# OpenAI function tools that map to MCP server tools; built once and reused for every request
+_OPENAI_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "search_foods",
+            "description": "Search for foods in the USDA FoodData Central database",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Search query for food items"
+                    }
+                },
+                "required": ["query"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "classify_food",
+            "description": "Classify a food image; returns class and confidence",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "image_path": {
+                        "type": "string",
+                        "description": "Path to the image file to classify"
+                    }
+                },
+                "required": ["image_path"]
+            }
+        }
+    }
+]
+
+
+# Shared OpenAI client (created on first use; reuses its HTTP connection pool)
+_openai_client = None
+
+
+def _get_openai_client():
+    """Return the process-wide OpenAI client, creating it on first use."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAI()
+    return _openai_client
+
+
+_search_cache_ready = False
+
+
+def _search_cache() -> sqlite3.Connection:
+    """Open the search cache database, creating its table on first use in this process."""
+    global _search_cache_ready
+    conn = sqlite3.connect(SEARCH_CACHE_PATH)
+    if not _search_cache_ready:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS search "
+                "(query TEXT PRIMARY KEY, payload TEXT, fetched_at INTEGER)"
+            )
+        _search_cache_ready = True
+    return conn
+
+
+def _read_search_cache(key: str) -> Optional[str]:
+    """Return the cached search payload for a normalized query, if still fresh."""
+    with closing(_search_cache()) as conn:
+        row = conn.execute(
+            "SELECT payload FROM search WHERE query = ? AND fetched_at > ?",
+            (key, int(time.time()) - SEARCH_CACHE_TTL)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def _write_search_cache(key: str, payload: str):
+    """Store a search payload under its normalized query."""
+    with closing(_search_cache()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO search (query, payload, fetched_at) VALUES (?, ?, ?)",
+            (key, payload, int(time.time()))
+        )
+
+
+def _assistant_message(message) -> Dict[str, Any]:
+    """History entry for an assistant reply, with its tool calls as plain dicts."""
+    entry: Dict[str, Any] = {"role": "assistant", "content": message.content}
+    if message.tool_calls:
+        entry["tool_calls"] = [
+            {
+                "id": tool_call.id,
+                "type": "function",
+                "function": {"name": tool_call.function.name, "arguments": tool_call.function.arguments}
+            }
+            for tool_call in message.tool_calls
+        ]
+    return entry
+
+
+def _tool_message(content: str, tool_call_id: str) -> Dict[str, Any]:
+    """History entry answering one tool call."""
+    return {"role": "tool", "content": content, "tool_call_id": tool_call_id}
+
+
+def _stream_chat_completion(client, on_token: Callable[[str], None], **kwargs) -> SimpleNamespace:
+    """Run a streamed chat completion, passing text deltas to ``on_token`` as they arrive.
+
+    Returns an object shaped like the non-streamed message (``content`` and
+    ``tool_calls`` with ``id`` and ``function.name``/``function.arguments``),
+    with tool calls reassembled from their streamed fragments.
+    """
+    content_parts: List[str] = []
+    calls: Dict[int, Dict[str, Any]] = {}
+    for chunk in client.chat.completions.create(stream=True, **kwargs):
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            content_parts.append(delta.content)
+            on_token(delta.content)
+        for fragment in delta.tool_calls or ():
+            call = calls.setdefault(fragment.index, {"id": None, "name": "", "arguments": []})
+            if fragment.id:
+                call["id"] = fragment.id
+            if fragment.function:
+                call["name"] += fragment.function.name or ""
+                call["arguments"].append(fragment.function.arguments or "")
+
+    tool_calls = [
+        SimpleNamespace(
+            id=call["id"],
+            function=SimpleNamespace(name=call["name"], arguments="".join(call["arguments"]))
+        )
+        for _, call in sorted(calls.items())
+    ]
+    return SimpleNamespace(content="".join(content_parts) or None, tool_calls=tool_calls or None)
+
+
+class _TTLCache:
+    """Small LRU cache whose entries expire ``ttl`` seconds after being stored."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key) -> Any:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+# Image digests by (path, mtime_ns, size), so an unchanged file is hashed only once
+_image_digests = _TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+
+
+def _image_digest(path: str) -> str:
+    """Hex SHA-256 of a file's contents, so identical images share a cache entry."""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    digest = _image_digests.get(key)
+    if digest is None:
+        with open(path, "rb") as f:
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
+            else:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        _image_digests.set(key, digest)
+    return digest
+
+
+# food_summary results by (normalized label, use_openai); USDA data changes rarely
+_summary_cache = _TTLCache(maxsize=1024, ttl=24 * 60 * 60)
+
+
+# Placeholder replies from the OpenAI analysis; like errors, they are never cached
+NO_RESPONSE_SUMMARY = "No response generated"
+MAX_ITERATIONS_SUMMARY = "Maximum iterations reached. Analysis may be incomplete."
+
+
+def _is_cacheable_summary(result: Any) -> bool:
+    """Tell summaries with real content apart, so failures and placeholders are never cached."""
+    if isinstance(result, dict):
+        return "error" not in result and bool(result.get("nutrients"))
+    if not isinstance(result, str) or not result.strip():
+        return False
+    return not result.startswith("Error") and result not in (NO_RESPONSE_SUMMARY, MAX_ITERATIONS_SUMMARY)
+
+
+def _is_failed_tool_result(result: Any) -> bool:
+    """Tell a failed tool call from its structured result (an "error" key or "Error: ..." text)."""
+    if isinstance(result, dict):
+        return "error" in result
+    return isinstance(result, str) and result.startswith("Error:")
 
 
 class FoodHelper:
     """Complete helper class for food-related operations using MCP server."""
 
     def __init__(self):
-        self.mcp_server_path = str(MCP_SERVER_PATH)
-
-    async def _get_mcp_session(self):
-        """Create and return an MCP client session."""
-        params = StdioServerParameters(
-            command=sys.executable,
-            args=[self.mcp_server_path],
-            env=None
-        )
-        return stdio_client(params)
+        self.server_params = MCP_SERVER_PARAMS
+        # One MCP server subprocess per helper, started on first use and kept until aclose()
+        self._session: Optional[ClientSession] = None
+        self._session_task: Optional[asyncio.Task] = None
+        self._session_lock = asyncio.Lock()
+        self._closing = asyncio.Event()
+        self._tool_slots = asyncio.Semaphore(MAX_CONCURRENT_TOOL_CALLS)
+        # Successful tool results by (tool, normalized query or image digest); shared, do not mutate
+        self._results = _TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+        # Keep-alive pool for direct USDA searches, created on first use
+        self._http: Optional[httpx.AsyncClient] = None
+        # OpenAI function name -> coroutine, so each model tool call is a single dict lookup
+        self._openai_dispatch = {
+            "search_foods": self._search_foods_for_model,
+            "classify_food": self.classify_food,
+        }
+
+    async def _run_session(self, ready: asyncio.Future):
+        """Own the stdio transport and client session until aclose() is requested.
+
+        Runs in its own task so the transport's cancel scopes are entered and
+        exited by the same task, whichever caller happened to start it.
+        """
+        try:
+            async with stdio_client(self.server_params) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    self._session = session
+                    ready.set_result(session)
+                    await self._closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+        finally:
+            self._session = None
+
+    async def _get_session(self) -> ClientSession:
+        """Return the shared MCP client session, starting the server on first use."""
+        async with self._session_lock:
+            if self._session is None:
+                self._closing.clear()
+                ready = asyncio.get_running_loop().create_future()
+                self._session_task = asyncio.create_task(self._run_session(ready))
+                return await ready
+            return self._session
+
+    async def aclose(self):
+        """Close the direct USDA HTTP client and shut down the MCP server subprocess, if started."""
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
+        if self._session_task is not None:
+            task, self._session_task = self._session_task, None
+            self._closing.set()
+            # The task may already be cancelled (e.g. by asyncio.run() shutting down)
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def __aenter__(self) -> "FoodHelper":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> Optional[str]:
+        """Call an MCP tool over the shared session; return its text, or None if the tool failed.
+
+        Raises TimeoutError if the call takes longer than TOOL_CALL_TIMEOUT seconds.
+        """
+        session = await self._get_session()
+        async with self._tool_slots:
+            try:
+                result = await asyncio.wait_for(
+                    session.call_tool(name=name, arguments=arguments),
+                    timeout=TOOL_CALL_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"{name} timed out after {TOOL_CALL_TIMEOUT:g}s") from None
+        if result.isError or not result.content:
+            return None
+        return result.content[0].text
+
+    async def _search_usda(self, query: str) -> Optional[str]:
+        """Search FoodData Central directly (same query as the backend's /api/search); None on HTTP error."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=USDA_BASE_URL,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+                timeout=httpx.Timeout(30.0)
+            )
+        params = {
+            "query": query,
+            "pageSize": 1,
+            "pageNumber": 1,
+            "sortBy": "dataType.keyword",
+            "sortOrder": "asc",
+            "api_key": USDA_API_KEY
+        }
+        async with self._tool_slots:
+            response = await self._http.get("/foods/search", params=params)
+        if response.is_error:
+            return None
+        return response.text
 
     async def search_foods(self, query: str) -> Dict[str, Any]:
         """
         Search for foods in the USDA FoodData Central database.
 
+        Queries FoodData Central directly when USDA_API_KEY is set, otherwise goes
+        through the MCP server's search_foods tool.
+
         Args:
             query: Search query for food items
 
         Returns:
-            Dictionary containing search results or error information
+            Dictionary containing search results or error information.
+            Successful results are cached in memory for RESULT_CACHE_TTL seconds and
+            on disk for SEARCH_CACHE_TTL seconds (query case and extra whitespace ignored).
         """
+        key = " ".join(query.split()).lower()
+        cached = self._results.get(("search_foods", key))
+        if cached is not None:
+            return cached
         try:
-            async with await self._get_mcp_session() as (read_stream, write_stream):
-                async with ClientSession(read_stream, write_stream) as session:
-                    await session.initialize()
-
-                    result = await session.call_tool(
-                        name="search_foods",
-                        arguments={"query": query}
-                    )
-
-                    if result.isError or not result.content:
-                        return {"error": "Search failed", "query": query}
-
-                    return json.loads(result.content[0].text)
+            # SQLite calls block, so keep them off the event loop shared by concurrent lookups
+            cached_payload = await asyncio.to_thread(_read_search_cache, key)
+            if cached_payload is not None:
+                data = _loads(cached_payload)
+                self._results.set(("search_foods", key), data)
+                return data
+
+            if USDA_API_KEY:
+                payload = await self._search_usda(query)
+            else:
+                payload = await self._call_tool("search_foods", {"query": query})
+            if payload is None:
+                return {"error": "Search failed", "query": query}
+
+            data = _loads(payload)
+            await asyncio.to_thread(_write_search_cache, key, payload)
+            self._results.set(("search_foods", key), data)
+            return data
         except Exception as e:
             return {"error": str(e), "query": query}
 
-    # async def get_food_details(self, fdc_id: int, format: str = "full") -> Dict[str, Any]:
-    #     """
-    #     Get detailed information about a specific food item.
-    #
-    #     Args:
-    #         fdc_id: Food Data Central ID
-    #         format: Response format ('full' or 'abridged')
-    #
-    #     Returns:
-    #         Dictionary containing food details or error information
-    #     """
-    #     try:
-    #         async with await self._get_mcp_session() as (read_stream, write_stream):
-    #             async with ClientSession(read_stream, write_stream) as session:
-    #                 await session.initialize()
-    #
-    #                 result = await session.call_tool(
-    #                     name="get_food_details",
-    #                     arguments={"fdc_id": fdc_id, "format": format}
-    #                 )
-    #
-    #                 if result.isError or not result.content:
-    #                     return {"error": "Food details fetch failed", "fdc_id": fdc_id}
-    #
-    #                 return json.loads(result.content[0].text)
-    #     except Exception as e:
-    #         return {"error": str(e), "fdc_id": fdc_id}
-    #
-    # async def get_multiple_foods(self, fdc_ids: List[int], format: str = "full") -> Dict[str, Any]:
-    #     """
-    #     Get information about multiple food items.
-    #
-    #     Args:
-    #         fdc_ids: List of Food Data Central IDs
-    #         format: Response format ('full' or 'abridged')
-    #
-    #     Returns:
-    #         Dictionary containing multiple food details or error information
-    #     """
-    #     try:
-    #         async with await self._get_mcp_session() as (read_stream, write_stream):
-    #             async with ClientSession(read_stream, write_stream) as session:
-    #                 await session.initialize()
-    #
-    #                 result = await session.call_tool(
-    #                     name="get_multiple_foods",
-    #                     arguments={"fdc_ids": fdc_ids, "format": format}
-    #                 )
-    #
-    #                 if result.isError or not result.content:
-    #                     return {"error": "Multiple foods fetch failed", "fdc_ids": fdc_ids}
-    #
-    #                 return json.loads(result.content[0].text)
-    #     except Exception as e:
-    #         return {"error": str(e), "fdc_ids": fdc_ids}
-
     async def classify_food(self, image_path: str) -> Dict[str, Any]:
         """
         Classify a food image using the MCP server's classify tool.
@@ -130,154 +508,80 @@ class FoodHelper:
             image_path: Path to the image file to classify
 
         Returns:
-            Dictionary containing classification results or error information
+            Dictionary containing classification results or error information.
+            Successful results are cached in memory by image content for RESULT_CACHE_TTL seconds.
         """
         try:
-            async with await self._get_mcp_session() as (read_stream, write_stream):
-                async with ClientSession(read_stream, write_stream) as session:
-                    await session.initialize()
-
-                    result = await session.call_tool(
-                        name="classify",
-                        arguments={"image_path": image_path}
-                    )
-
-                    if result.isError or not result.content:
-                        return {"error": "Classification failed", "image_path": image_path}
-
-                    return json.loads(result.content[0].text)
+            digest = await asyncio.to_thread(_image_digest, image_path)
+            cached = self._results.get(("classify", digest))
+            if cached is not None:
+                return cached
+
+            payload = await self._call_tool("classify", {"image_path": image_path})
+            if payload is None:
+                return {"error": "Classification failed", "image_path": image_path}
+
+            data = _loads(payload)
+            if data.get("success"):
+                self._results.set(("classify", digest), data)
+            return data
         except Exception as e:
             return {"error": str(e), "image_path": image_path}
 
     def _get_openai_tools(self) -> List[Dict[str, Any]]:
-        """Define OpenAI function tools that map to MCP server tools."""
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "search_foods",
-                    "description": "Search for foods in the USDA FoodData Central database",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Search query for food items"
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                }
-            },
-            # {
-            #     "type": "function",
-            #     "function": {
-            #         "name": "get_food_details",
-            #         "description": "Get detailed information about a specific food item",
-            #         "parameters": {
-            #             "type": "object",
-            #             "properties": {
-            #                 "fdc_id": {
-            #                     "type": "integer",
-            #                     "description": "Food Data Central ID"
-            #                 },
-            #                 "format": {
-            #                     "type": "string",
-            #                     "enum": ["full", "abridged"],
-            #                     "default": "full",
-            #                     "description": "Response format"
-            #                 }
-            #             },
-            #             "required": ["fdc_id"]
-            #         }
-            #     }
-            # },
-            # {
-            #     "type": "function",
-            #     "function": {
-            #         "name": "get_multiple_foods",
-            #         "description": "Get information about multiple food items",
-            #         "parameters": {
-            #             "type": "object",
-            #             "properties": {
-            #                 "fdc_ids": {
-            #                     "type": "array",
-            #                     "items": {"type": "integer"},
-            #                     "description": "List of Food Data Central IDs"
-            #                 },
-            #                 "format": {
-            #                     "type": "string",
-            #                     "enum": ["full", "abridged"],
-            #                     "default": "full",
-            #                     "description": "Response format"
-            #                 }
-            #             },
-            #             "required": ["fdc_ids"]
-            #         }
-            #     }
-            # },
-            {
-                "type": "function",
-                "function": {
-                    "name": "classify_food",
-                    "description": "Classify a food image and return the predicted class and confidence score",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "image_path": {
-                                "type": "string",
-                                "description": "Path to the image file to classify"
-                            }
-                        },
-                        "required": ["image_path"]
-                    }
-                }
-            }
-        ]
+        """Define OpenAI function tools that map to MCP server tools (shared, do not mutate)."""
+        return _OPENAI_TOOLS
 
-    async def _handle_openai_tool_call(self, tool_call) -> str:
-        """Handle OpenAI tool calls by routing to MCP server tools."""
+    async def _handle_openai_tool_call(self, tool_call) -> Any:
+        """Handle OpenAI tool calls by routing to MCP server tools; returns the unserialized result."""
         function_name = tool_call.function.name
-        arguments = json.loads(tool_call.function.arguments)
-
-        if function_name == "search_foods":
-            result = await self.search_foods(**arguments)
-        # elif function_name == "get_food_details":
-        #     result = await self.get_food_details(**arguments)
-        # elif function_name == "get_multiple_foods":
-        #     result = await self.get_multiple_foods(**arguments)
-        elif function_name == "classify_food":
-            result = await self.classify_food(**arguments)
-        else:
+        handler = self._openai_dispatch.get(function_name)
+        if handler is None:
             result = {"error": f"Unknown function: {function_name}"}
+        else:
+            result = await handler(**_loads(tool_call.function.arguments))
 
-        return json.dumps(result)
+        return result
 
-    async def food_summary_with_openai(self, food_items: List[str]) -> str:
+    async def _search_foods_for_model(self, query: str) -> Dict[str, Any]:
+        """search_foods with each hit compacted for the model's context."""
+        result = await self.search_foods(query)
+        if result.get("foods"):
+            result = {"foods": [_compact_food(food) for food in result["foods"]]}
+        return result
+
+    async def food_summary_with_openai(self, food_items: List[str],
+                                       on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         Get comprehensive food analysis using OpenAI with MCP tools.
 
         Args:
             food_items: List of food item names to analyze
+            on_token: Optional callback receiving response text as it streams in
+                (e.g. to print it); the full text is still returned
 
         Returns:
             Comprehensive nutritional analysis as a string
         """
-        try:
-            from openai import OpenAI
-            from openai.types.chat import ChatCompletionMessageParam
-        except ImportError:
+        if OpenAI is None:
             return "Error: OpenAI package not installed. Please install with 'pip install openai'"
 
-        openai_key = os.getenv("OPENAI_API_KEY")
-        if not openai_key:
+        if not OPENAI_API_KEY:
             return "Error: OPENAI_API_KEY not set in environment variables"
 
-        client = OpenAI()
-        model = os.getenv("OPENAI_TEST_MODEL", "gpt-4o-mini")
+        client = _get_openai_client()
+        model = OPENAI_MODEL
+
+        # Look every item up concurrently before the first model call, so the model
+        # usually answers without a tool round trip
+        search_results = await asyncio.gather(*(self.search_foods(item) for item in food_items))
+        prefetched = {}
+        for item, result in zip(food_items, search_results):
+            foods = result.get("foods")
+            prefetched[item] = _compact_food(foods[0]) if foods else {"error": result.get("error", "No foods found")}
 
         # Initial system message
-        messages = cast(List[ChatCompletionMessageParam], [
+        messages: List[Dict[str, Any]] = [
             {
                 "role": "system",
                 "content": (
@@ -288,60 +592,162 @@ class FoodHelper:
                     "nutritional information like calories, protein, carbohydrates, fats, vitamins, and minerals."
                 )
             },
+            {
+                "role": "system",
+                "content": (
+                    "Pre-fetched USDA search results (top match per item). Only call tools for items "
+                    f"missing here or marked with an error: {_dumps(prefetched)}"
+                )
+            },
             {
                 "role": "user",
                 "content": f"Please analyze the nutrition information for these food items: {', '.join(food_items)}"
             }
-        ])
+        ]
 
         tools = self._get_openai_tools()
-        max_iterations = 10
+        max_iterations = 3
         iteration = 0
+        # (tool name, raw arguments) -> consecutive failures, and the previous assistant text,
+        # so a tool that keeps failing or a model repeating itself ends the loop early
+        failures: Dict[tuple, int] = {}
+        last_content = None
+        # Calls made so far; a repeated call means the model has what it needs, so it is
+        # answered (cheaply, from the result cache) and the next turn must be the final answer
+        calls_seen: Dict[tuple, int] = {}
+        force_answer = False
+        # Tool replies before the previous assistant turn get digested so the history stays small
+        previous_turn = 0
+        digested_upto = 0
 
         while iteration < max_iterations:
             iteration += 1
 
             try:
-                response = client.chat.completions.create(
+                request = dict(
                     model=model,
                     messages=messages,
                     tools=tools,
-                    tool_choice="auto",
+                    tool_choice="none" if force_answer or iteration == max_iterations else "auto",
                     temperature=0.2,
                     max_tokens=2000,
                 )
-
-                message = response.choices[0].message
-                messages.append(cast(ChatCompletionMessageParam, {
-                    "role": "assistant",
-                    "content": message.content,
-                    "tool_calls": message.tool_calls
-                }))
+                if on_token is None:
+                    message = client.chat.completions.create(**request).choices[0].message
+                else:
+                    message = _stream_chat_completion(client, on_token, **request)
+
+                turn = len(messages)
+                messages.append(_assistant_message(message))
+                for old in messages[digested_upto:previous_turn]:
+                    if old["role"] == "tool":
+                        old["content"] = _digest_tool_result(old["content"])
+                digested_upto, previous_turn = previous_turn, turn
 
                 if not message.tool_calls:
                     # No more tool calls, return the final response
-                    return message.content or "No response generated"
+                    return message.content or NO_RESPONSE_SUMMARY
 
-                # Handle tool calls
-                for tool_call in message.tool_calls:
-                    tool_result = await self._handle_openai_tool_call(tool_call)
-                    messages.append(cast(ChatCompletionMessageParam, {
-                        "role": "tool",
-                        "content": tool_result,
-                        "tool_call_id": tool_call.id
-                    }))
+                if message.content and message.content == last_content:
+                    return "Error: analysis stopped because the model repeated its previous reply"
+                last_content = message.content
+
+                # Tool calls in one turn are independent; run them together, answer in order
+                tool_results = await asyncio.gather(
+                    *(self._handle_openai_tool_call(tool_call) for tool_call in message.tool_calls),
+                    return_exceptions=True
+                )
+                # A call that raised (e.g. malformed arguments) still gets an answer, as an error
+                tool_results = [
+                    {"error": str(result)} if isinstance(result, Exception) else result
+                    for result in tool_results
+                ]
+                messages.extend(
+                    _tool_message(_dumps(tool_result), tool_call.id)
+                    for tool_call, tool_result in zip(message.tool_calls, tool_results)
+                )
+
+                tool_chars = sum(len(old["content"]) for old in messages if old["role"] == "tool")
+                for old in messages:
+                    if tool_chars <= MAX_TOOL_HISTORY_CHARS:
+                        break
+                    if old["role"] == "tool":
+                        truncated = _dumps({"truncated": True})
+                        tool_chars -= len(old["content"]) - len(truncated)
+                        old["content"] = truncated
+
+                for tool_call, tool_result in zip(message.tool_calls, tool_results):
+                    key = (tool_call.function.name, tool_call.function.arguments)
+                    calls_seen[key] = calls_seen.get(key, 0) + 1
+                    if calls_seen[key] >= 2:
+                        force_answer = True
+                    if _is_failed_tool_result(tool_result):
+                        failures[key] = failures.get(key, 0) + 1
+                        if failures[key] >= 2:
+                            return (
+                                f"Error: analysis stopped because {tool_call.function.name} kept failing "
+                                f"for {tool_call.function.arguments}"
+                            )
+                    else:
+                        failures.pop(key, None)
 
             except Exception as e:
                 return f"Error during OpenAI analysis: {str(e)}"
 
-        return "Maximum iterations reached. Analysis may be incomplete."
+        return MAX_ITERATIONS_SUMMARY
+
+    async def food_summary_single_with_openai(self, label: str) -> Optional[str]:
+        """
+        Summarize one food with a single OpenAI completion over its already-fetched USDA data.
+
+        Args:
+            label: The food label/name to summarize
 
-    async def food_summary_basic(self, label: str) -> Dict[str, Any]:
+        Returns:
+            Formatted summary, or an error string if the lookup fails. None when OpenAI
+            is not configured, so the caller can fall back to food_summary_with_openai().
+        """
+        if OpenAI is None or not OPENAI_API_KEY:
+            return None
+        search_result = await self.search_foods(label)
+        if "error" in search_result:
+            return f"Error searching for {label}: {search_result['error']}"
+        foods = search_result.get("foods")
+        if not foods:
+            return f"Error: no foods found for {label}"
+
+        try:
+            response = _get_openai_client().chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (
+                            "You are a senior nutrition expert. Summarize the USDA data you are given clearly "
+                            "with sections: Nutrients, Portions, Other Information, Ingredients. Be concise and "
+                            "practical. If a section is unavailable, state 'Not available'."
+                        )
+                    },
+                    {
+                        "role": "user",
+                        "content": f"USDA data for {label}: {_dumps(_compact_food(foods[0]))}"
+                    }
+                ],
+                temperature=0,
+                max_tokens=400,
+            )
+        except Exception as e:
+            return f"Error during OpenAI analysis: {str(e)}"
+        return response.choices[0].message.content or NO_RESPONSE_SUMMARY
+
+    async def food_summary_basic(self, label: str, include_all: bool = False) -> Dict[str, Any]:
         """
         Get basic nutritional summary for a food item (without OpenAI).
 
         Args:
             label: The food label/name to search for
+            include_all: Return every reported nutrient under "nutrients", not just the
+                six summarized ones (default: False)
 
         Returns:
             Dictionary containing nutritional information and summary
@@ -366,11 +772,11 @@ class FoodHelper:
                     "source": "food_helper"
                 }
 
-            # Get the first food item's details
+            # The search hit already carries its nutrients, so no details request is needed
             first_food = search_result["foods"][0]
             fdc_id = first_food.get("fdcId")
 
-            if not fdc_id:
+            if not first_food.get("foodNutrients"):
                 return {
                     "label": label,
                     "food_name": first_food.get("description", label),
@@ -378,60 +784,56 @@ class FoodHelper:
                     "source": "food_helper"
                 }
 
-            # Get detailed nutritional information
-            details_result = await self.get_food_details(fdc_id, format="full")
-
-            if "error" in details_result:
-                return {
-                    "label": label,
-                    "food_name": first_food.get("description", label),
-                    "summary": f"Found {first_food.get('description', label)} but failed to retrieve detailed nutrition information",
-                    "source": "food_helper"
-                }
-
-            # Extract key nutritional information
+            # One pass over the nutrient list: wanted amounts by short key, plus the
+            # "nutrients" table; stops early once every wanted nutrient is found.
+            # Search hits are flat ({nutrientName, value, unitName}); food details nest
+            # them ({nutrient: {name, unitName}, amount}), so both shapes are read.
+            wanted = {}
             nutrients = {}
-            if "foodNutrients" in details_result:
-                for nutrient in details_result["foodNutrients"]:
-                    nutrient_name = nutrient.get("nutrient", {}).get("name", "")
-                    nutrient_value = nutrient.get("amount", 0)
-                    nutrient_unit = nutrient.get("nutrient", {}).get("unitName", "")
-
-                    if nutrient_name and nutrient_value:
-                        nutrients[nutrient_name] = {
-                            "amount": nutrient_value,
-                            "unit": nutrient_unit
-                        }
+            for nutrient in first_food["foodNutrients"]:
+                if "nutrientName" in nutrient:
+                    nutrient_name = nutrient["nutrientName"]
+                    nutrient_value = nutrient.get("value")
+                    unit = nutrient.get("unitName", "")
+                else:
+                    info = nutrient.get("nutrient") or {}
+                    nutrient_name = info.get("name")
+                    nutrient_value = nutrient.get("amount")
+                    unit = info.get("unitName", "")
+                if not nutrient_value:
+                    continue
+                key = _WANTED_NUTRIENTS.get(nutrient_name)
+                if key == "calories" and unit.lower() != "kcal":
+                    # Energy is also reported in kJ; the summary is in kcal
+                    key = None
+                    nutrient_name = f"{nutrient_name} ({unit})"
+                if key is None and not include_all:
+                    continue
+                nutrients[nutrient_name] = {"amount": nutrient_value, "unit": unit}
+                if key is not None:
+                    wanted[key] = nutrient_value
+                    if not include_all and len(wanted) == len(_WANTED_NUTRIENTS):
+                        break
 
             # Create summary
-            food_name = details_result.get("description", first_food.get("description", label))
-            calories = nutrients.get("Energy", {}).get("amount", "Unknown")
-            protein = nutrients.get("Protein", {}).get("amount", "Unknown")
-            carbs = nutrients.get("Carbohydrate, by difference", {}).get("amount", "Unknown")
-            fat = nutrients.get("Total lipid (fat)", {}).get("amount", "Unknown")
-            fiber = nutrients.get("Fiber, total dietary", {}).get("amount", "Unknown")
-            sodium = nutrients.get("Sodium, Na", {}).get("amount", "Unknown")
-
-            summary_text = f"Nutritional information for {food_name}:\n"
-            summary_text += f"• Calories: {calories} kcal per 100g\n" if calories != "Unknown" else ""
-            summary_text += f"• Protein: {protein}g per 100g\n" if protein != "Unknown" else ""
-            summary_text += f"• Carbohydrates: {carbs}g per 100g\n" if carbs != "Unknown" else ""
-            summary_text += f"• Fat: {fat}g per 100g\n" if fat != "Unknown" else ""
-            summary_text += f"• Fiber: {fiber}g per 100g\n" if fiber != "Unknown" else ""
-            summary_text += f"• Sodium: {sodium}mg per 100g" if sodium != "Unknown" else ""
+            food_name = first_food.get("description", label)
+            summary_lines = [f"Nutritional information for {food_name}:"]
+            for key, name, unit in _SUMMARY_LINES:
+                if key in wanted:
+                    summary_lines.append(f"• {name}: {wanted[key]}{unit} per 100g")
 
             return {
                 "label": label,
                 "food_name": food_name,
                 "fdc_id": fdc_id,
-                "calories_per_100g": calories,
-                "protein_per_100g": protein,
-                "carbs_per_100g": carbs,
-                "fat_per_100g": fat,
-                "fiber_per_100g": fiber,
-                "sodium_per_100g": sodium,
+                "calories_per_100g": wanted.get("calories", "Unknown"),
+                "protein_per_100g": wanted.get("protein", "Unknown"),
+                "carbs_per_100g": wanted.get("carbs", "Unknown"),
+                "fat_per_100g": wanted.get("fat", "Unknown"),
+                "fiber_per_100g": wanted.get("fiber", "Unknown"),
+                "sodium_per_100g": wanted.get("sodium", "Unknown"),
                 "nutrients": nutrients,
-                "summary": summary_text.strip(),
+                "summary": "\n".join(summary_lines),
                 "source": "USDA FoodData Central"
             }
 
@@ -464,10 +866,9 @@ class FoodHelper:
                 "source": "OpenAI + USDA FoodData Central"
             }
         else:
-            # Use basic analysis for each item
-            results = {}
-            for item in food_items:
-                results[item] = await self.food_summary_basic(item)
+            # Use basic analysis for each item, concurrently over the shared MCP session
+            summaries = await asyncio.gather(*(self.food_summary_basic(item) for item in food_items))
+            results = dict(zip(food_items, summaries))
 
             return {
                 "method": "basic",
@@ -477,29 +878,63 @@ class FoodHelper:
             }
 
 
-# Convenience functions for direct use
-async def search_foods(query: str) -> Dict[str, Any]:
-    """Search for foods in the USDA FoodData Central database."""
+# Helper shared by the convenience functions: (event loop, helper, closer task)
+_shared: Optional[tuple] = None
+
+
+async def _close_when_cancelled(helper: FoodHelper):
+    """Wait until cancelled, then close the helper on its own event loop.
+
+    asyncio.run() cancels leftover tasks before it closes the loop, so this
+    releases the helper's HTTP client and MCP subprocess when the loop ends.
+    """
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await helper.aclose()
+
+
+def _shared_helper() -> FoodHelper:
+    """Return the module-wide helper, so repeated calls reuse one MCP server subprocess.
+
+    A new helper is created when called from a different event loop (e.g. a later
+    asyncio.run()), and the old one is closed on its own loop. Callers that manage
+    their loop by hand (rather than asyncio.run()) should ``await aclose()`` before
+    closing it.
+    """
+    global _shared
+    loop = asyncio.get_running_loop()
+    if _shared is not None and _shared[0] is loop:
+        return _shared[1]
+
+    if _shared is not None:
+        old_loop, _, old_closer = _shared
+        if not old_loop.is_closed():
+            old_loop.call_soon_threadsafe(old_closer.cancel)
     helper = FoodHelper()
-    return await helper.search_foods(query)
+    _shared = (loop, helper, loop.create_task(_close_when_cancelled(helper)))
+    return helper
+
 
+async def aclose():
+    """Close the shared helper (HTTP client and MCP server subprocess) used by the convenience functions."""
+    global _shared
+    if _shared is not None:
+        closer = _shared[2]
+        _shared = None
+        closer.cancel()
+        await asyncio.gather(closer, return_exceptions=True)
 
-# async def get_food_details(fdc_id: int, format: str = "full") -> Dict[str, Any]:
-#     """Get detailed information about a specific food item."""
-#     helper = FoodHelper()
-#     return await helper.get_food_details(fdc_id, format)
-#
-#
-# async def get_multiple_foods(fdc_ids: List[int], format: str = "full") -> Dict[str, Any]:
-#     """Get information about multiple food items."""
-#     helper = FoodHelper()
-#     return await helper.get_multiple_foods(fdc_ids, format)
+
+# Convenience functions for direct use
+async def search_foods(query: str) -> Dict[str, Any]:
+    """Search for foods in the USDA FoodData Central database."""
+    return await _shared_helper().search_foods(query)
 
 
 async def classify_food(image_path: str) -> Dict[str, Any]:
     """Classify a food image."""
-    helper = FoodHelper()
-    return await helper.classify_food(image_path)
+    return await _shared_helper().classify_food(image_path)
 
 
 async def food_summary(label: str, use_openai: bool = True) -> Any:
@@ -511,41 +946,96 @@ async def food_summary(label: str, use_openai: bool = True) -> Any:
         use_openai: Whether to use OpenAI for analysis (default: True)
 
     Returns:
-        String (if use_openai=True) or Dictionary (if use_openai=False) containing analysis
+        String (if use_openai=True) or Dictionary (if use_openai=False) containing analysis.
+        Successful results are cached for 24 hours per label (case and surrounding
+        whitespace ignored); the cached object is shared, so do not mutate it.
     """
-    helper = FoodHelper()
-
+    # Normalize only the cache key; the helpers see the caller's label as written
+    label = label.strip()
+    key = (label.lower(), use_openai)
+    cached = _summary_cache.get(key)
+    if cached is not None:
+        return cached
+
+    helper = _shared_helper()
     if use_openai:
-        return await helper.food_summary_with_openai([label])
+        # One label needs no tool loop: fetch it, then a single completion formats it
+        result = await helper.food_summary_single_with_openai(label)
+        if result is None:
+            result = await helper.food_summary_with_openai([label])
     else:
-        return await helper.food_summary_basic(label)
+        result = await helper.food_summary_basic(label)
+
+    if _is_cacheable_summary(result):
+        _summary_cache.set(key, result)
+    return result
+
+
+async def food_summaries(labels: List[str]) -> List[Dict[str, Any]]:
+    """
+    Get basic nutritional summaries for several food items at once.
+
+    Cached labels are answered immediately; the rest are looked up concurrently
+    over a single MCP server session.
+
+    Args:
+        labels: Food labels/names to search for
+
+    Returns:
+        List of summary dictionaries in the same order as ``labels``
+    """
+    labels = [label.strip() for label in labels]
+    keys = [label.lower() for label in labels]
+    results = [_summary_cache.get((key, False)) for key in keys]
+    # Each distinct uncached label is looked up once (as first written), in first-seen order
+    missing: Dict[str, str] = {}
+    for key, label, result in zip(keys, labels, results):
+        if result is None:
+            missing.setdefault(key, label)
+
+    if missing:
+        helper = _shared_helper()
+        fetched = dict(zip(missing, await asyncio.gather(*(helper.food_summary_basic(label) for label in missing.values()))))
+
+        for key, result in fetched.items():
+            if _is_cacheable_summary(result):
+                _summary_cache.set((key, False), result)
+        results = [fetched[key] if result is None else result for key, result in zip(keys, results)]
+
+    return results
 
 
 async def batch_food_analysis(food_items: List[str], use_openai: bool = True) -> Dict[str, Any]:
     """Analyze multiple food items at once."""
-    helper = FoodHelper()
-    return await helper.batch_food_analysis(food_items, use_openai)
+    return await _shared_helper().batch_food_analysis(food_items, use_openai)
 
 
 # Example usage
 if __name__ == "__main__":
     async def example_usage():
-        # Initialize helper
-        helper = FoodHelper()
-
-        #Example 1: Search for foods
-        # print("=== Searching for 'chai' ===")
-        # search_result = await helper.search_foods("chai")
-        # print(json.dumps(search_result, indent=2))
-
-        # Example 2: OpenAI-powered analysis (if API key is available)
-        if os.getenv("OPENAI_API_KEY"):
-            print("\n=== OpenAI Food Analysis ===")
-            ai_analysis = await helper.food_summary_with_openai(["dhokla", "cheesecake", "chai"])
-            print(ai_analysis)
-
+        # One helper (and one MCP server subprocess) for every call in the block
+        async with FoodHelper() as helper:
+            #Example 1: Search for foods
+            # print("=== Searching for 'chai' ===")
+            # search_result = await helper.search_foods("chai")
+            # print(json.dumps(search_result, indent=2))
+
+            # Example 2: OpenAI-powered analysis (if API key is available)
+            if OPENAI_API_KEY:
+                print("\n=== OpenAI Food Analysis ===")
+                await helper.food_summary_with_openai(
+                    ["dhokla", "cheesecake", "chai"],
+                    on_token=lambda text: print(text, end="", flush=True)
+                )
+                print()
 
-        # food_name = await helper.classify_food(".\\..\\data\Test\\cheesecake\\cheesecake-1314.jpg")
-        # print(food_name)         # Run the example
+            # food_name = await helper.classify_food(".\\..\\data\Test\\cheesecake\\cheesecake-1314.jpg")
+            # print(food_name)         # Run the example
 
-    asyncio.run(example_usage())
+    try:
+        # Optional: faster event loop for the stdio/HTTP-bound example run (not available on Windows)
+        import uvloop
+    except ImportError:
+        asyncio.run(example_usage())
+    else:
+        uvloop.run(example_usage())